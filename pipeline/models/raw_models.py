@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import TypedDict, Optional, List
 
 
@@ -25,14 +26,32 @@ class RawFirmRecord(TypedDict, total=False):
     Offices: List[RawOfficeRecord]
 
 
-class NormalizedAddress(TypedDict):
+# ---------------------------------------------------------
+# NORMALIZED RECORDS (output of normalize.py)
+# Plain slotted dataclasses: values are checked in normalize.py before
+# construction, so no per-record Pydantic validation is paid here.
+# to_dict() keeps the field order of the published firms/offices.json;
+# from_dict() rebuilds a record from it (stage cache reloads).
+# ---------------------------------------------------------
+
+@dataclass(slots=True)
+class NormalizedAddress:
     streetAddress: str
     addressLocality: str
     postalCode: str
     addressCountry: str
 
+    def to_dict(self) -> dict:
+        return {
+            "streetAddress": self.streetAddress,
+            "addressLocality": self.addressLocality,
+            "postalCode": self.postalCode,
+            "addressCountry": self.addressCountry,
+        }
+
 
-class NormalizedFirm(TypedDict):
+@dataclass(slots=True)
+class NormalizedFirm:
     sraId: str
     sraNumber: str
     name: str
@@ -42,9 +61,43 @@ class NormalizedFirm(TypedDict):
     companyRegNo: str
     constitution: str
 
+    def to_dict(self) -> dict:
+        return {
+            "sraId": self.sraId,
+            "sraNumber": self.sraNumber,
+            "name": self.name,
+            "regulatoryStatus": self.regulatoryStatus,
+            "authorisationType": self.authorisationType,
+            "organisationType": self.organisationType,
+            "companyRegNo": self.companyRegNo,
+            "constitution": self.constitution,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "NormalizedFirm":
+        return cls(**d)
 
-class NormalizedOffice(TypedDict):
+
+@dataclass(slots=True)
+class NormalizedOffice:
     officeId: str
     firmSraId: str
     isHeadOffice: bool
     address: NormalizedAddress
+
+    def to_dict(self) -> dict:
+        return {
+            "officeId": self.officeId,
+            "firmSraId": self.firmSraId,
+            "isHeadOffice": self.isHeadOffice,
+            "address": self.address.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "NormalizedOffice":
+        return cls(
+            officeId=d["officeId"],
+            firmSraId=d["firmSraId"],
+            isHeadOffice=d["isHeadOffice"],
+            address=NormalizedAddress(**d["address"]),
+        )
@@ -2,7 +2,7 @@
 Normalize raw SRA firm/office records into Tier‑0 canonical format.
 
 Improvements applied based on Feedback v3:
-    - Full Pydantic validation (no dicts)
+    - Full validation (Pydantic rules; slotted dataclass records out)
     - Removal of validate.py dependency
     - Strict data integrity checks
     - Canonical normalized models
@@ -11,8 +11,9 @@ Improvements applied based on Feedback v3:
     - Absolute imports (ready for packaging)
 """
 
+import sys
 import logging
-from typing import List
+from typing import Iterable, Iterator, List
 
 from pydantic import BaseModel, Field, ValidationError
 from pipeline.utils.config_loader import load_config
@@ -21,25 +22,23 @@ from pipeline.models.raw_models import RawOfficeRecord
 from pipeline.models.raw_models import RawFirmRecord, NormalizedFirm, NormalizedOffice, NormalizedAddress
 
 
+# Version of the normalized output (firms.json / offices.json). Part of
+# the stage cache key: bump it whenever a change here or in raw_models
+# alters what normalization produces for the same input.
+NORMALIZE_VERSION = 1
 
-cfg = load_config()
-HEAD_OFFICE = cfg.head_office_code
-
-class NormalizedAddress(BaseModel):
+# Validation rules for the normalized records. Every _clean() result is
+# already a str, so the only rule that can fail is min_length=1: it is
+# checked inline, and these models are only instantiated on that failure
+# path to raise / log the exact ValidationError.
+class NormalizedAddressModel(BaseModel):
     streetAddress: str = Field(..., min_length=1)
     addressLocality: str = Field(..., min_length=1)
     postalCode: str = Field(..., min_length=1)
     addressCountry: str = Field(..., min_length=1)
 
 
-class NormalizedOffice(BaseModel):
-    officeId: str = Field(..., min_length=1)
-    firmSraId: str = Field(..., min_length=1)
-    isHeadOffice: bool
-    address: NormalizedAddress
-
-
-class NormalizedFirm(BaseModel):
+class NormalizedFirmModel(BaseModel):
     sraId: str = Field(..., min_length=1)
     sraNumber: str = ""
     name: str = Field(..., min_length=1)
@@ -51,38 +50,71 @@ class NormalizedFirm(BaseModel):
 
 
 def _clean(value) -> str:
+    """
+    Collapse runs of whitespace to single spaces and strip the ends.
+
+    Most SRA values are already clean (or are int ids), so those return
+    without the split/join list allocation. strip() drops the same edge
+    whitespace as split(), and isprintable() is False for every
+    whitespace character except the ASCII space, so the fast path only
+    has to rule out doubled spaces inside.
+    """
     if not value:
         return ""
-    return " ".join(str(value).split())
+    if type(value) is int:
+        return str(value)
+    s = str(value).strip()
+    if s.isprintable() and "  " not in s:
+        return s
+    return " ".join(s.split())
 
 
 from pydantic import ValidationError
 
 def _build_address(office: RawOfficeRecord) -> NormalizedAddress | None:
-    street = " ".join(
-        p
-        for p in [
-            office.get("Address1"),
-            office.get("Address2"),
-            office.get("Address3"),
-            office.get("Address4"),
-        ]
-        if p
-    )
+    get = office.get
+    a1, a2, a3, a4 = get("Address1"), get("Address2"), get("Address3"), get("Address4")
 
-    try:
+    # ~5% of SRA offices carry no street lines at all. streetAddress is
+    # required (min_length=1), so they can never validate: drop them
+    # without cleaning the remaining fields or building a ValidationError.
+    if not (a1 or a2 or a3 or a4):
+        logging.error(
+            "Office validation failed for firm %s office %s: no street address",
+            get("FirmId"),
+            get("OfficeId"),
+        )
+        return None
+
+    street = _clean(" ".join(p for p in (a1, a2, a3, a4) if p))
+    locality = _clean(get("Town"))
+    postcode = _clean(get("Postcode"))
+    # Low-cardinality: share one str object across all offices.
+    country = sys.intern(_clean(get("Country")))
+
+    if street and locality and postcode and country:
         return NormalizedAddress(
-            streetAddress=_clean(street),
-            addressLocality=_clean(office.get("Town")),
-            postalCode=_clean(office.get("Postcode")),
-            addressCountry=_clean(office.get("Country")),
+            streetAddress=street,
+            addressLocality=locality,
+            postalCode=postcode,
+            addressCountry=country,
+        )
+
+    try:
+        NormalizedAddressModel(
+            streetAddress=street,
+            addressLocality=locality,
+            postalCode=postcode,
+            addressCountry=country,
         )
     except ValidationError as e:
         logging.error(
-            f"Office validation failed for firm {office.get('FirmId')} "
-            f"office {office.get('OfficeId')}: {e}"
+            "Office validation failed for firm %s office %s: %s",
+            get("FirmId"),
+            get("OfficeId"),
+            e,
         )
-        return None
+    return None
 
 
 
@@ -90,23 +122,31 @@ def _build_address(office: RawOfficeRecord) -> NormalizedAddress | None:
 
 
 
-def normalise_records(records: List[dict]) -> tuple[List[NormalizedFirm], List[NormalizedOffice]]:
+def iter_normalised(
+    records: Iterable[dict],
+) -> Iterator[tuple[NormalizedFirm, List[NormalizedOffice]]]:
     """
-    Normalize raw SRA records → Tier-0 canonical models (validated via Pydantic)
+    Lazily normalize raw SRA records, one firm at a time.
+
+    Yields each firm together with its own offices, in input order, so a
+    streaming consumer (jsonld_builder.build_and_save_jsonld_from_pairs)
+    needs neither the full lists nor an offices-by-firm index. The firm /
+    office counts are logged once the records are exhausted.
 
     Args:
-        records (List[dict]): Raw SRA dataset loaded from fetch_sra
+        records: Raw SRA dataset loaded from fetch_sra
 
-    Returns:
-        (firms, offices):
-            firms: List[NormalizedFirm]
-            offices: List[NormalizedOffice]
+    Yields:
+        (firm, firm_offices)
 
     Raises:
-        ValidationError: If a record or office fails schema validation
+        ValidationError: If a firm record fails schema validation
+            (offices with an invalid address are logged and skipped)
     """
-    firms: List[NormalizedFirm] = []
-    offices: List[NormalizedOffice] = []
+    # Read on first use rather than at import, so importing this module
+    # needs no config.yaml (load_config is cached per file version).
+    head_office = load_config().head_office_code
+    firm_count = office_count = 0
 
     for idx, rec in enumerate(records):
         firm_id = _clean(rec.get("Id"))
@@ -114,52 +154,78 @@ def normalise_records(records: List[dict]) -> tuple[List[NormalizedFirm], List[N
             logging.warning("Skipping raw record with no Id at index %d", idx)
             continue
 
-        try:
-            firm = NormalizedFirm(
-                sraId=firm_id,
-                sraNumber=_clean(rec.get("SraNumber")),
-                name=_clean(rec.get("PracticeName")),
-                regulatoryStatus=_clean(rec.get("AuthorisationStatus")),
-                authorisationType=_clean(rec.get("AuthorisationType")),
-                organisationType=_clean(rec.get("OrganisationType")),
-                companyRegNo=_clean(rec.get("CompanyRegNo")),
-                constitution=_clean(rec.get("Constitution")),
-            )
-            firms.append(firm)
+        # Status / type / constitution have at most a few dozen distinct
+        # values: intern them so every firm shares one str object each.
+        firm = NormalizedFirm(
+            sraId=firm_id,
+            sraNumber=_clean(rec.get("SraNumber")),
+            name=_clean(rec.get("PracticeName")),
+            regulatoryStatus=sys.intern(_clean(rec.get("AuthorisationStatus"))),
+            authorisationType=sys.intern(_clean(rec.get("AuthorisationType"))),
+            organisationType=sys.intern(_clean(rec.get("OrganisationType"))),
+            companyRegNo=_clean(rec.get("CompanyRegNo")),
+            constitution=sys.intern(_clean(rec.get("Constitution"))),
+        )
+
+        if not firm.name:
+            try:
+                NormalizedFirmModel(**firm.to_dict())
+            except ValidationError as ve:
+                logging.error("Firm validation failed at index %d: %s", idx, ve)
+                raise
 
-        except ValidationError as ve:
-            logging.error("Firm validation failed at index %d: %s", idx, ve)
-            raise
+        firm_offices: List[NormalizedOffice] = []
 
-       
         for office in rec.get("Offices") or []:
             office_id = _clean(office.get("OfficeId"))
             if not office_id:
                 logging.warning("Skipping office with no OfficeId in firm %s", firm_id)
                 continue
 
-            try:
-                # addr = _build_address(office)
-                addr = _build_address(office)
-                if addr is None:
-                    continue
+            addr = _build_address(office)
+            if addr is None:
+                continue
 
-                office_obj = NormalizedOffice(
+            # officeId / firmSraId are non-empty (checked above) and
+            # isHeadOffice is a bool by construction: nothing left to validate.
+            firm_offices.append(
+                NormalizedOffice(
                     officeId=office_id,
                     firmSraId=firm_id,
-                    isHeadOffice=office.get("OfficeType") == HEAD_OFFICE,
+                    isHeadOffice=office.get("OfficeType") == head_office,
                     address=addr,
                 )
-                offices.append(office_obj)
+            )
 
-            except ValidationError as ve:
-                logging.error(
-                    "Office validation failed for firm %s office %s: %s",
-                    firm_id,
-                    office_id,
-                    ve,
-                )
-                raise
+        firm_count += 1
+        office_count += len(firm_offices)
+        yield firm, firm_offices
+
+    logging.info("Normalisation OK → %d firms, %d offices", firm_count, office_count)
+
+
+def normalise_records(records: List[dict]) -> tuple[List[NormalizedFirm], List[NormalizedOffice]]:
+    """
+    Normalize raw SRA records → Tier-0 canonical records (validated against
+    the Pydantic rules above)
+
+    Args:
+        records (List[dict]): Raw SRA dataset loaded from fetch_sra
+
+    Returns:
+        (firms, offices):
+            firms: List[NormalizedFirm]
+            offices: List[NormalizedOffice]
+
+    Raises:
+        ValidationError: If a firm record fails schema validation
+            (offices with an invalid address are logged and skipped)
+    """
+    firms: List[NormalizedFirm] = []
+    offices: List[NormalizedOffice] = []
+
+    for firm, firm_offices in iter_normalised(records):
+        firms.append(firm)
+        offices.extend(firm_offices)
 
-    logging.info("Normalisation OK → %d firms, %d offices", len(firms), len(offices))
     return firms, offices
@@ -3,7 +3,8 @@ Orchestrate the Tier‑0 end‑to‑end workflow in strict deterministic order:
 
 1. fetch SRA raw input
 2. normalise → Pydantic-validated canonical models
-3. write normalized intermediates (firms.json, offices.json)
+3. write normalized intermediates (firms.json, offices.json); with
+   emit_intermediates=False steps 2–4 run as one streamed pass instead
 4. build JSON‑LD (firms.jsonld + dataset.jsonld)
 5. build manifest.jsonld (only signed artifact)
 6. final logging and exit
@@ -12,15 +13,16 @@ This file contains *no business logic*.
 It only orchestrates modules that each perform one responsibility.
 """
 
-import json
+import time
 import logging
 from pathlib import Path
-from datetime import datetime
-from pipeline.utils.atomic_writer import atomic_write_json
+from pipeline.utils.atomic_writer import stream_write_json_array
+from pipeline.utils import stage_cache
 from pipeline.utils.config_loader import load_config
 from pipeline.fetch_sra import fetch_sra_from_file
-from pipeline.normalize import normalise_records
-from pipeline.jsonld_builder import build_and_save_jsonld
+from pipeline.normalize import iter_normalised, normalise_records
+from pipeline.models.raw_models import NormalizedFirm, NormalizedOffice
+from pipeline.jsonld_builder import build_and_save_jsonld, build_and_save_jsonld_from_pairs
 from pipeline.manifest_builder import build_manifest_and_sign
 
 
@@ -49,37 +51,84 @@ def run():
     subscription_key = cfg.subscription_key
 
     raw_output_dir.mkdir(parents=True, exist_ok=True)
-    normalized_output_dir.mkdir(parents=True, exist_ok=True)
 
-    today = datetime.now().strftime("%Y%m%d")
+    # One clock read per run: the raw dump date (local) and the
+    # dateModified shared by dataset.jsonld and manifest.jsonld (UTC).
+    now = time.time()
+    today = time.strftime("%Y%m%d", time.localtime(now))
+    run_timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(now))
     raw_output_path = raw_output_dir / f"sra-{today}.json"
 
     logging.info("Step 1 — Fetching records…")
     records = fetch_sra_from_file(input_path, raw_output_path , fetch_url, subscription_key)
 
-    logging.info("Step 2 — Normalising records…")
-    firms, offices = normalise_records(records)
-
-    logging.info("Step 3 — Writing normalized intermediates…")
-    firms_dict = [f.model_dump() for f in firms]
-    offices_dict = [o.model_dump() for o in offices]
-
-    atomic_write_json(normalized_output_dir / "firms.json", firms_dict)
-    atomic_write_json(normalized_output_dir / "offices.json", offices_dict)
-
-    logging.info("Step 4 — Building JSON‑LD (firms + dataset)…")
-    build_and_save_jsonld(
-        firms=firms,
-        offices=offices,
-        firms_output_path=jsonld_firms_path,
-        dataset_output_path=jsonld_dataset_path,
-    )
+    if not cfg.emit_intermediates:
+        # Nothing to write or cache between the stages: stream each
+        # normalized firm straight into the JSON‑LD writer (one pass, no
+        # firm/office lists, no offices-by-firm index).
+        logging.info("Steps 2–4 — Normalising + building JSON‑LD in one pass…")
+        build_and_save_jsonld_from_pairs(
+            iter_normalised(records),
+            firms_output_path=jsonld_firms_path,
+            dataset_output_path=jsonld_dataset_path,
+            run_timestamp=run_timestamp,
+        )
+        # Intermediates from an earlier staged run would now contradict
+        # the published graph.
+        stage_cache.discard_normalized(
+            normalized_output_dir,
+            Path(cfg.cache_dir) if cfg.cache_dir else None,
+        )
+    else:
+        # Steps 2–3 are a pure function of (input bytes, config): reuse the
+        # cached intermediates when both are unchanged.
+        cache_entry = None
+        cached = None
+        if cfg.cache_dir:
+            cache_entry = Path(cfg.cache_dir) / stage_cache.stage_cache_key(input_path, cfg)
+            cached = stage_cache.load_normalized(cache_entry, normalized_output_dir)
+
+        if cached is not None:
+            logging.info("Steps 2–3 — Reusing cached normalized intermediates…")
+            firms, offices = cached
+        else:
+            logging.info("Step 2 — Normalising records…")
+            firms, offices = normalise_records(records)
+
+            logging.info("Step 3 — Writing normalized intermediates…")
+            # Streamed in small batches (no list of dicts, no whole-file buffer).
+            # Regenerated from the raw input on every run: no fsync needed.
+            stream_write_json_array(
+                normalized_output_dir / "firms.json",
+                firms,
+                durable=False,
+                key=NormalizedFirm.to_dict,
+            )
+            stream_write_json_array(
+                normalized_output_dir / "offices.json",
+                offices,
+                durable=False,
+                key=NormalizedOffice.to_dict,
+            )
+
+            if cache_entry is not None:
+                stage_cache.store_normalized(cache_entry, normalized_output_dir)
+
+        logging.info("Step 4 — Building JSON‑LD (firms + dataset)…")
+        build_and_save_jsonld(
+            firms=firms,
+            offices=offices,
+            firms_output_path=jsonld_firms_path,
+            dataset_output_path=jsonld_dataset_path,
+            run_timestamp=run_timestamp,
+        )
 
     logging.info("Step 5 — Building manifest.jsonld…")
     build_manifest_and_sign(
         firms_path=jsonld_firms_path,
         dataset_path=jsonld_dataset_path,
         manifest_output_path=jsonld_manifest_path,
+        run_timestamp=run_timestamp,
     )
 
     logging.info("✔ Pipeline completed successfully.")
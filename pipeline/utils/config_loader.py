@@ -5,14 +5,18 @@ Implements:
     - atomic, deterministic config loading
     - strict schema validation using Pydantic
     - environment variable overrides (optional)
+    - per-process cache keyed on file identity + overrides
+    - YAML (default), TOML (.toml) or JSON (.json) config files
     - absolute imports (Feedback v3)
 """
 
 import os
-import yaml
+import tomllib
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from pydantic import BaseModel, Field, ValidationError
+from pipeline.utils import json_codec
 
 
 class PipelineConfig(BaseModel):
@@ -35,8 +39,29 @@ class PipelineConfig(BaseModel):
 
     head_office_code: str = "HEAD OFFICE"
 
-    fetch_url: str = Field(..., description="URL to fetch SRA dataset from")
-    subscription_key: str = Field(..., description="Subscription key for SRA API")
+    fetch_url: str | None = Field(
+        None, description="URL to fetch SRA dataset from (None → use input_file as-is)"
+    )
+    subscription_key: str | None = Field(None, description="Subscription key for SRA API")
+
+    cache_dir: str | None = Field(
+        None, description="Stage cache root for normalized outputs (None → disabled)"
+    )
+    emit_intermediates: bool = Field(
+        True,
+        description="Write firms.json / offices.json (False → normalize and build JSON‑LD in one pass)",
+    )
+
+
+# VT_* environment variable → config key (see _apply_env_overrides).
+_ENV_OVERRIDES = {
+    "VT_INPUT_FILE": "input_file",
+    "VT_RAW_OUTPUT_DIR": "raw_output_dir",
+    "VT_NORMALIZED_OUTPUT_DIR": "normalized_output_dir",
+    "VT_JSONLD_FIRMS": "jsonld_firms",
+    "VT_JSONLD_DATASET": "jsonld_dataset",
+    "VT_JSONLD_MANIFEST": "jsonld_manifest",
+}
 
 
 def _apply_env_overrides(cfg: dict) -> dict:
@@ -55,29 +80,48 @@ def _apply_env_overrides(cfg: dict) -> dict:
         VT_JSONLD_MANIFEST
     """
 
-    mapping = {
-        "VT_INPUT_FILE": "input_file",
-        "VT_RAW_OUTPUT_DIR": "raw_output_dir",
-        "VT_NORMALIZED_OUTPUT_DIR": "normalized_output_dir",
-        "VT_JSONLD_FIRMS": "jsonld_firms",
-        "VT_JSONLD_DATASET": "jsonld_dataset",
-        "VT_JSONLD_MANIFEST": "jsonld_manifest",
-    }
-
-    for env_key, cfg_key in mapping.items():
+    for env_key, cfg_key in _ENV_OVERRIDES.items():
         if env_key in os.environ:
             cfg[cfg_key] = os.environ[env_key]
 
     return cfg
 
 
+def _parse_config_file(cfg_path: Path):
+    """
+    Parse a config file by suffix: .toml → tomllib, .json → json_codec,
+    anything else → YAML. PyYAML is imported only for YAML files, so
+    TOML/JSON configs skip its import (~16 ms).
+    """
+    if cfg_path.suffix == ".toml":
+        with cfg_path.open("rb") as f:
+            return tomllib.load(f)
+
+    if cfg_path.suffix == ".json":
+        return json_codec.loads(cfg_path.read_bytes())
+
+    import yaml
+
+    # libyaml-backed safe loader when PyYAML was built with it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with cfg_path.open("r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader)
+
+
 def load_config(path: str = "config.yaml") -> PipelineConfig:
     """
-    Load YAML configuration, apply env overrides, validate via Pydantic,
-    and return a strongly‑typed PipelineConfig object.
+    Load YAML (or .toml / .json) configuration, apply env overrides,
+    validate via Pydantic, and return a strongly‑typed PipelineConfig
+    object.
+
+    Several modules call this at import and again at run time. The parsed
+    result is cached per (absolute path, mtime, size, VT_* overrides), so
+    repeat calls skip YAML parsing and validation, while an edited file,
+    a different working directory or a changed override still reloads.
+    Callers share the returned object and must not mutate it.
 
     Args:
-        path: Path to config.yaml
+        path: Path to config.yaml (or a .toml / .json equivalent)
 
     Returns:
         PipelineConfig
@@ -92,14 +136,24 @@ def load_config(path: str = "config.yaml") -> PipelineConfig:
     if not cfg_path.exists():
         raise FileNotFoundError(f"Configuration file not found: {path}")
 
+    st = cfg_path.stat()
+    overrides = tuple((k, os.environ.get(k)) for k in _ENV_OVERRIDES)
+    return _load_config_cached(cfg_path.resolve(), st.st_mtime_ns, st.st_size, overrides)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(cfg_path: Path, mtime_ns: int, size: int, overrides: tuple) -> PipelineConfig:
+    """
+    Parse + validate one config file version (see load_config).
+    mtime_ns / size / overrides only take part in the cache key.
+    """
     try:
-        with cfg_path.open("r", encoding="utf-8") as f:
-            cfg_dict = yaml.safe_load(f)
+        cfg_dict = _parse_config_file(cfg_path)
     except OSError as e:
         raise OSError(f"Failed to read configuration file: {e}")
 
     if not isinstance(cfg_dict, dict):
-        raise ValueError("Invalid configuration file: expected YAML dictionary at root")
+        raise ValueError("Invalid configuration file: expected a mapping at root")
 
     cfg_dict = _apply_env_overrides(cfg_dict)
 
@@ -0,0 +1,147 @@
+# pipeline/utils/json_codec.py
+
+"""
+Shared JSON encode/decode helpers for Tier‑0 pipeline.
+
+Features:
+    - orjson fast path (Rust parser, bytes in / bytes out)
+    - transparent fallback to stdlib json when orjson is not installed
+    - single place to change JSON backend for the whole pipeline
+
+Backend choice:
+    msgspec.json was evaluated as a lower-memory encoder for firms.jsonld.
+    On the full SRA graph (44 MB pretty-printed) it used more extra RSS
+    (73 MB vs 42 MB) and more time (0.105s vs 0.059s) than orjson, so
+    orjson remains the only fast backend.
+
+Used by:
+    - fetch_sra.py
+    - atomic_writer.py
+    - jsonld_builder.py
+    - manifest_builder.py
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this single type regardless of the active backend.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes):
+    """
+    Parse a UTF‑8 JSON document.
+
+    Args:
+        data: Raw JSON bytes (read straight from disk / network).
+
+    Returns:
+        Parsed Python object.
+
+    Raises:
+        JSONDecodeError
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def dumps_compact(data, newline: bool = False) -> bytes:
+    """
+    Serialize to minified UTF‑8 JSON (production default for outputs).
+
+    Args:
+        data: JSON‑serializable object
+        newline: Append a trailing "\\n" (whole-file documents)
+
+    Returns:
+        Encoded JSON bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(data, option=option)
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def dumps(data, pretty: bool = False, newline: bool = False) -> bytes:
+    """Minified by default; indent=2 when `pretty` (debugging)."""
+    return dumps_pretty(data, newline) if pretty else dumps_compact(data, newline)
+
+
+def dumps_pretty(data, newline: bool = False) -> bytes:
+    """
+    Serialize to human‑readable UTF‑8 JSON (indent=2, non‑ASCII kept as‑is).
+
+    Args:
+        data: JSON‑serializable object
+        newline: Append a trailing "\\n" (whole-file documents)
+
+    Returns:
+        Encoded JSON bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(data, option=option)
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def _reject_floats(data) -> None:
+    """
+    Raise TypeError if `data` contains a float anywhere (see dumps_canonical).
+    """
+    if isinstance(data, float):
+        raise TypeError(f"Canonical JSON does not support floats: {data!r}")
+    if isinstance(data, dict):
+        for value in data.values():
+            _reject_floats(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            _reject_floats(value)
+
+
+def dumps_canonical(data) -> bytes:
+    """
+    Serialize to canonical Phase‑4 JSON bytes used for hashing/signing.
+
+    Canonical form (must stay bit‑identical across runs and backends):
+      - keys sorted lexicographically
+      - minified separators (",", ":"), no whitespace
+      - non‑ASCII emitted as raw UTF‑8 (no \\u escapes)
+      - strings, ints, bools and null only: no floats
+
+    Floats are excluded because the backends format some of them
+    differently (orjson 1e16 vs stdlib 1e+16). Canonical pipeline
+    documents (graph entities, dataset, manifest, stage cache key) hold
+    none; the stdlib fallback rejects them rather than emit bytes whose
+    hash would depend on whether orjson is installed.
+
+    Args:
+        data: JSON‑serializable object
+
+    Returns:
+        Canonical UTF‑8 JSON bytes.
+
+    Raises:
+        TypeError: data contains a float (stdlib fallback only).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    _reject_floats(data)
+    return json.dumps(
+        data,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode("utf-8")
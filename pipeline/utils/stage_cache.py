@@ -0,0 +1,148 @@
+# pipeline/utils/stage_cache.py
+
+"""
+Content‑addressed cache for the normalization stage.
+
+Features:
+    - cache key = SHA‑256(input file bytes + canonical config JSON
+      + normalize.NORMALIZE_VERSION)
+    - only the latest entry is kept (older keys pruned on store)
+    - discard_normalized() clears both for single-pass runs
+    - cached firms.json / offices.json hard‑linked (no copy) when possible
+    - atomic publish: link → tmp, then rename (readers never see partials)
+    - a miss or unreadable entry just means "normalize again"
+
+Layout:
+    <cache_dir>/<key>/firms.json
+    <cache_dir>/<key>/offices.json
+
+Used by:
+    - run_pipeline.py
+"""
+
+import os
+import re
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pipeline import normalize
+from pipeline.utils import json_codec
+from pipeline.models.raw_models import NormalizedFirm, NormalizedOffice
+
+STAGE_FILES = ("firms.json", "offices.json")
+
+_KEY_DIR = re.compile(r"[0-9a-f]{64}")
+
+
+def stage_cache_key(input_path: Path, cfg) -> str:
+    """
+    Key for one (input file, config, normalize version) triple.
+
+    Args:
+        input_path: Raw SRA input that normalization reads
+        cfg: PipelineConfig (subscription_key excluded; it cannot change output)
+
+    Returns:
+        Hexadecimal SHA‑256 key.
+    """
+    digest = hashlib.sha256()
+    with input_path.open("rb") as f:
+        digest.update(hashlib.file_digest(f, "sha256").digest())
+    digest.update(json_codec.dumps_canonical(cfg.model_dump(exclude={"subscription_key"})))
+    digest.update(b"normalize-v%d" % normalize.NORMALIZE_VERSION)
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Atomically make `dst` a hard link to `src` (copy across filesystems).
+    """
+    # rename() of two links to the same inode is a no-op that would leave
+    # the temp link behind.
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+
+    tmp = dst.with_suffix(dst.suffix + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    tmp.replace(dst)
+
+
+def load_normalized(
+    entry_dir: Path,
+    output_dir: Path,
+) -> Optional[Tuple[List[NormalizedFirm], List[NormalizedOffice]]]:
+    """
+    On a cache hit, publish the cached intermediates into `output_dir` and
+    return the records rebuilt from them.
+
+    Returns:
+        (firms, offices), or None on a miss / unreadable entry.
+    """
+    if not all((entry_dir / name).is_file() for name in STAGE_FILES):
+        return None
+
+    try:
+        firms_raw = json_codec.loads((entry_dir / "firms.json").read_bytes())
+        offices_raw = json_codec.loads((entry_dir / "offices.json").read_bytes())
+
+        firms = [NormalizedFirm.from_dict(d) for d in firms_raw]
+        offices = [NormalizedOffice.from_dict(d) for d in offices_raw]
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name in STAGE_FILES:
+            _link_or_copy(entry_dir / name, output_dir / name)
+
+    except (OSError, json_codec.JSONDecodeError, KeyError, TypeError) as e:
+        logging.warning(f"❌ Ignoring unreadable stage cache {entry_dir}: {e}")
+        return None
+
+    logging.info(f"✔ Stage cache hit → {entry_dir}")
+    return firms, offices
+
+
+def store_normalized(entry_dir: Path, output_dir: Path) -> None:
+    """
+    Record freshly written intermediates from `output_dir` under `entry_dir`
+    and prune every other key entry: a changed input (e.g. a new nightly
+    fetch) never hits an old entry again, so only the latest one is kept.
+    Failures are logged and ignored: the cache is an optimisation only.
+    """
+    try:
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        for name in STAGE_FILES:
+            _link_or_copy(output_dir / name, entry_dir / name)
+
+        _prune_entries(entry_dir.parent, keep=entry_dir)
+    except OSError as e:
+        logging.warning(f"❌ Failed to populate stage cache {entry_dir}: {e}")
+
+
+def _prune_entries(cache_dir: Path, keep: Optional[Path] = None) -> None:
+    """Remove every key entry under `cache_dir` except `keep`."""
+    for old in cache_dir.iterdir():
+        if old != keep and old.is_dir() and _KEY_DIR.fullmatch(old.name):
+            shutil.rmtree(old)
+
+
+def discard_normalized(output_dir: Path, cache_dir: Optional[Path] = None) -> None:
+    """
+    Remove intermediates left by an earlier staged run, together with the
+    stage cache entries, so that readers never see firms.json /
+    offices.json contradicting a graph built without them.
+
+    Raises:
+        OSError: If an existing intermediate cannot be removed.
+    """
+    for name in STAGE_FILES:
+        (output_dir / name).unlink(missing_ok=True)
+
+    if cache_dir is not None and cache_dir.is_dir():
+        _prune_entries(cache_dir)
+
@@ -0,0 +1,69 @@
+import os
+import json
+from textwrap import dedent
+
+import pytest
+
+from pipeline.run_pipeline import run
+from pipeline.utils.config_loader import load_config
+
+
+@pytest.fixture(scope="session")
+def pipeline_run(tmp_path_factory):
+    """
+    Run the full pipeline once per session on a one-firm input.
+
+    Yields:
+        (run directory, PipelineConfig); config paths are relative to it.
+    """
+    tmp_path = tmp_path_factory.mktemp("pipeline")
+
+    (tmp_path / "config.yaml").write_text(
+        dedent(
+            """
+            input_file: "./response.txt"
+            raw_output_dir: "./raw"
+            normalized_output_dir: "./norm"
+            jsonld_firms: "./norm/firms.jsonld"
+            jsonld_dataset: "./norm/dataset.jsonld"
+            jsonld_manifest: "./norm/manifest.jsonld"
+            public_files_base: "https://api.test/files/"
+            public_id_base: "https://api.test/id/"
+            head_office_code: "HEAD OFFICE"
+            """
+        )
+    )
+
+    (tmp_path / "response.txt").write_text(
+        json.dumps(
+            [
+                {
+                    "Id": "F1",
+                    "PracticeName": "Firm One",
+                    "AuthorisationStatus": "Active",
+                    "Offices": [
+                        {
+                            "OfficeId": "O1",
+                            "OfficeType": "HEAD OFFICE",
+                            "Address1": "A",
+                            "Town": "T",
+                            "Postcode": "P",
+                            "Country": "UK",
+                        }
+                    ],
+                }
+            ]
+        )
+    )
+
+    # The pipeline reads config + input relative to the CWD. monkeypatch is
+    # function-scoped, so switch and restore it by hand.
+    prev_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        run()
+        cfg = load_config("config.yaml")
+    finally:
+        os.chdir(prev_cwd)
+
+    yield tmp_path, cfg
@@ -0,0 +1,26 @@
+import json
+
+from pipeline.utils.config_loader import load_config
+
+
+_CFG = {
+    "input_file": "./response.txt",
+    "raw_output_dir": "./raw",
+    "normalized_output_dir": "./norm",
+    "jsonld_firms": "./norm/firms.jsonld",
+    "jsonld_dataset": "./norm/dataset.jsonld",
+    "jsonld_manifest": "./norm/manifest.jsonld",
+    "head_office_code": "HQ",
+}
+
+
+def test_yaml_toml_and_json_configs_match(tmp_path):
+    (tmp_path / "config.yaml").write_text("".join(f'{k}: "{v}"\n' for k, v in _CFG.items()))
+    (tmp_path / "config.toml").write_text("".join(f'{k} = "{v}"\n' for k, v in _CFG.items()))
+    (tmp_path / "config.json").write_text(json.dumps(_CFG))
+
+    from_yaml = load_config(str(tmp_path / "config.yaml"))
+
+    assert from_yaml.head_office_code == "HQ"
+    assert load_config(str(tmp_path / "config.toml")) == from_yaml
+    assert load_config(str(tmp_path / "config.json")) == from_yaml
@@ -0,0 +1,124 @@
+import json
+import hashlib
+
+import pytest
+
+from pipeline import fetch_sra
+from pipeline.fetch_sra import fetch_sra_from_file
+
+
+ORGS = [{"Id": 1, "PracticeName": "Firm é"}, {"Id": 2, "PracticeName": "Firm Two"}]
+BODY = json.dumps({"Organisations": ORGS}, ensure_ascii=False).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = {"Content-Length": str(len(body)), **(headers or {})}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_content(self, chunk_size):
+        return iter([self.content[i:i + 7] for i in range(0, len(self.content), 7)])
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def get(self, url, headers, timeout, stream):
+        self.requests.append(headers)
+        return self.response
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    def install(response):
+        session = FakeSession(response)
+        monkeypatch.setattr(fetch_sra, "_session", lambda: session)
+        return session
+
+    return install
+
+
+def _fetch(tmp_path):
+    return fetch_sra_from_file(
+        tmp_path / "response.txt", tmp_path / "raw.json", "https://sra.test/", "key"
+    )
+
+
+def test_small_200_parsed_in_memory(tmp_path, fake_get):
+    fake_get(FakeResponse(body=BODY, headers={"ETag": '"v1"'}))
+
+    assert _fetch(tmp_path) == ORGS
+
+    saved = json.loads((tmp_path / "response.txt").read_text(encoding="utf-8"))
+    assert saved["source"] == "SRA" and "retrievedAt" in saved
+    assert saved["Organisations"] == ORGS
+    assert json.loads((tmp_path / "raw.json").read_text(encoding="utf-8")) == ORGS
+
+    cache = json.loads((tmp_path / ".sra_cache.json").read_text())
+    assert cache["etag"] == '"v1"'
+    assert cache["sha256"] == hashlib.sha256((tmp_path / "response.txt").read_bytes()).hexdigest()
+
+
+def test_large_200_streamed_with_provenance(tmp_path, fake_get, monkeypatch):
+    monkeypatch.setattr(fetch_sra, "STREAM_PARSE_THRESHOLD_BYTES", 16)
+    fake_get(FakeResponse(body=BODY, headers={"ETag": '"v1"'}))
+
+    assert _fetch(tmp_path) == ORGS
+
+    saved = json.loads((tmp_path / "response.txt").read_text(encoding="utf-8"))
+    assert saved["source"] == "SRA" and "retrievedAt" in saved
+    assert json.loads((tmp_path / "raw.json").read_text(encoding="utf-8")) == ORGS
+    cache = json.loads((tmp_path / ".sra_cache.json").read_text())
+    assert cache["sha256"] == hashlib.sha256((tmp_path / "response.txt").read_bytes()).hexdigest()
+
+
+def test_304_reuses_cached_input(tmp_path, fake_get):
+    fake_get(FakeResponse(body=BODY, headers={"ETag": '"v1"'}))
+    _fetch(tmp_path)
+    input_bytes = (tmp_path / "response.txt").read_bytes()
+
+    session = fake_get(FakeResponse(status_code=304))
+
+    assert _fetch(tmp_path) == ORGS
+    assert session.requests[0]["If-None-Match"] == '"v1"'
+    assert (tmp_path / "response.txt").read_bytes() == input_bytes
+
+
+@pytest.mark.parametrize("cache_state", ["missing", "corrupt", "stale"])
+def test_unusable_cache_makes_unconditional_get(tmp_path, fake_get, cache_state):
+    fake_get(FakeResponse(body=BODY, headers={"ETag": '"v1"'}))
+    _fetch(tmp_path)
+
+    cache_path = tmp_path / ".sra_cache.json"
+    if cache_state == "missing":
+        cache_path.unlink()
+    elif cache_state == "corrupt":
+        cache_path.write_text("{not json")
+    else:
+        (tmp_path / "response.txt").write_text(json.dumps(ORGS))
+
+    session = fake_get(FakeResponse(body=BODY))
+
+    assert _fetch(tmp_path) == ORGS
+    assert "If-None-Match" not in session.requests[0]
+
+
+def test_non_object_body_is_written_verbatim(tmp_path, fake_get):
+    body = json.dumps(ORGS).encode("utf-8")
+    fake_get(FakeResponse(body=body))
+
+    assert _fetch(tmp_path) == ORGS
+    assert (tmp_path / "response.txt").read_bytes() == body
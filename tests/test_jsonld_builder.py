@@ -1,16 +1,31 @@
 import json
+import hashlib
 from pathlib import Path
 
+import pytest
+
+from pipeline import jsonld_builder
+from pipeline.utils import json_codec
 from pipeline.jsonld_builder import (
     compute_canonical_json_hash,
     build_jsonld_graph,
+    build_and_save_jsonld,
+    build_and_save_jsonld_from_pairs,
+)
+from pipeline.normalize import iter_normalised, normalise_records
+from pipeline.utils.atomic_writer import (
+    atomic_copy_file,
+    atomic_write_json,
+    stream_write_json_array,
+    stream_write_jsonld,
 )
-from pipeline.utils.atomic_writer import atomic_write_json
 
 from pipeline.models.jsonld_models import (
     OfficeModel,
     FirmModel,
     PostalAddressModel,
+    OfficeLD,
+    FirmLD,
 )
 
 
@@ -24,6 +39,17 @@ def test_canonical_hash_is_deterministic():
     assert h1 == h2
 
 
+def test_canonical_stdlib_fallback_matches_orjson_and_rejects_floats(monkeypatch):
+    data = {"b": [1, True, None, "é"], "a": {"y": 2, "x": "1e16"}}
+    expected = json_codec.dumps_canonical(data)
+
+    monkeypatch.setattr(json_codec, "orjson", None)
+
+    assert json_codec.dumps_canonical(data) == expected
+    with pytest.raises(TypeError):
+        json_codec.dumps_canonical({"a": [1e16]})
+
+
 def test_build_jsonld_graph_structure():
     firm = FirmModel(
         sraId="F1",
@@ -49,6 +75,72 @@ def test_build_jsonld_graph_structure():
     assert len(graph["@graph"]) == 2  # 1 firm + 1 office
 
 
+def test_build_jsonld_graph_accepts_dicts_and_drops_invalid():
+    firms = [{"sraId": "F1", "name": "Firm One", "regulatoryStatus": "Active"}]
+    offices = [
+        {"officeId": "O1", "firmSraId": "F1", "address": {"streetAddress": "X"}},
+        {"officeId": "O2", "firmSraId": "F1"},
+    ]
+
+    graph = build_jsonld_graph(firms, offices)
+
+    assert [e["@id"].rsplit("/", 1)[1] for e in graph["@graph"]] == ["F1", "O1"]
+
+
+def _as_json(obj):
+    """JSON view of a graph (the shared @type tuples become arrays)."""
+    return json.loads(json.dumps(obj))
+
+
+def test_graph_entities_match_ld_schema():
+    firm = FirmModel(sraId="F1", name="Firm One", regulatoryStatus="Active")
+    office = OfficeModel(
+        officeId="O1",
+        firmSraId="F1",
+        address=PostalAddressModel(streetAddress="X"),
+    )
+
+    firm_entity, office_entity = _as_json(build_jsonld_graph([firm], [office]))["@graph"]
+
+    assert FirmLD.model_validate(firm_entity).model_dump(by_alias=True) == firm_entity
+    assert OfficeLD.model_validate(office_entity).model_dump(by_alias=True) == office_entity
+
+
+def test_streamed_firms_jsonld_matches_graph(tmp_path):
+    firm = FirmModel(sraId="F1", name="Firm é", regulatoryStatus="Active")
+    office = OfficeModel(
+        officeId="O1",
+        firmSraId="F1",
+        address=PostalAddressModel(streetAddress="X"),
+    )
+    firms_path = tmp_path / "firms.jsonld"
+    dataset_path = tmp_path / "dataset.jsonld"
+
+    build_and_save_jsonld([firm], [office], firms_path, dataset_path)
+
+    graph = build_jsonld_graph([firm], [office])
+    assert json.loads(firms_path.read_text(encoding="utf-8")) == _as_json(graph)
+    dataset = json.loads(dataset_path.read_text())
+    assert dataset["canonicalSha256"] == compute_canonical_json_hash(graph)
+    # firms.jsonld is written in canonical form (plus trailing newline)
+    on_disk = hashlib.sha256(firms_path.read_bytes().rstrip(b"\n")).hexdigest()
+    assert on_disk == dataset["canonicalSha256"]
+
+
+def test_on_disk_hash_holds_for_unsorted_context(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        jsonld_builder, "VT_CONTEXT", {"vt": "https://v/", "@vocab": "https://v/", "a": "https://a/"}
+    )
+    firm = FirmModel(sraId="F1", name="Firm", regulatoryStatus="Active")
+    firms_path = tmp_path / "firms.jsonld"
+
+    build_and_save_jsonld([firm], [], firms_path, tmp_path / "dataset.jsonld")
+
+    dataset = json.loads((tmp_path / "dataset.jsonld").read_text())
+    on_disk = hashlib.sha256(firms_path.read_bytes().rstrip(b"\n")).hexdigest()
+    assert on_disk == dataset["canonicalSha256"]
+
+
 def test_atomic_write_json(tmp_path):
     path = tmp_path / "firms.jsonld"
     data = {"a": 1}
@@ -58,3 +150,97 @@ def test_atomic_write_json(tmp_path):
     assert path.exists()
     loaded = json.loads(path.read_text())
     assert loaded["a"] == 1
+
+
+def test_atomic_write_json_expected_prev_sha256(tmp_path):
+    path = tmp_path / "firms.jsonld"
+    atomic_write_json(path, {"a": 1})
+    prev = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    atomic_write_json(path, {"a": 2}, expected_prev_sha256=prev)
+    assert json.loads(path.read_text())["a"] == 2
+
+    with pytest.raises(ValueError):
+        atomic_write_json(path, {"a": 3}, expected_prev_sha256=prev)
+    assert json.loads(path.read_text())["a"] == 2
+
+
+def test_streamed_pairs_match_list_build(tmp_path):
+    raw = [
+        {
+            "Id": 7,
+            "PracticeName": "Firm Seven",
+            "AuthorisationStatus": "Active",
+            "Offices": [
+                {"OfficeId": 70, "Address1": "1 St", "Town": "Leeds", "Postcode": "LS1", "Country": "UK"},
+            ],
+        },
+        {"Id": 8, "PracticeName": "Firm Eight", "AuthorisationStatus": "Active"},
+    ]
+
+    build_and_save_jsonld(*normalise_records(raw), tmp_path / "a.jsonld", tmp_path / "da.jsonld")
+    build_and_save_jsonld_from_pairs(iter_normalised(raw), tmp_path / "b.jsonld", tmp_path / "db.jsonld")
+
+    assert (tmp_path / "a.jsonld").read_bytes() == (tmp_path / "b.jsonld").read_bytes()
+
+
+def test_atomic_write_json_skips_identical_rewrite(tmp_path):
+    path = tmp_path / "firms.json"
+    atomic_write_json(path, {"a": 1})
+    before = path.stat()
+
+    atomic_write_json(path, {"a": 1})
+    assert path.stat().st_ino == before.st_ino
+    assert path.stat().st_mtime_ns == before.st_mtime_ns
+    assert not path.with_suffix(".json.tmp").exists()
+
+    atomic_write_json(path, {"a": 2})
+    assert json.loads(path.read_text())["a"] == 2
+
+
+def test_atomic_copy_file_skips_identical_copy(tmp_path):
+    src = tmp_path / "src.json"
+    dst = tmp_path / "dst.json"
+    src.write_bytes(b"[1]\n")
+    atomic_copy_file(src, dst)
+    before = dst.stat()
+
+    atomic_copy_file(src, dst)
+    assert dst.stat().st_ino == before.st_ino
+    assert dst.stat().st_mtime_ns == before.st_mtime_ns
+
+    src.write_bytes(b"[2]\n")
+    atomic_copy_file(src, dst)
+    assert dst.read_bytes() == b"[2]\n"
+
+
+@pytest.mark.parametrize("n", [0, 1, 600])
+def test_stream_write_json_array_matches_atomic_write_json(tmp_path, n):
+    items = [{"i": i, "name": f"é{i}"} for i in range(n)]
+    atomic_write_json(tmp_path / "a.json", items)
+    stream_write_json_array(tmp_path / "b.json", iter(items))
+
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+
+def _failing_items():
+    yield {"a": 1}
+    raise ValueError("bad record")
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda path, items: stream_write_jsonld(path, {}, items),
+        stream_write_json_array,
+    ],
+)
+def test_stream_writers_remove_tmp_when_items_raise(tmp_path, write):
+    path = tmp_path / "out.json"
+    path.write_bytes(b"previous")
+
+    with pytest.raises(ValueError):
+        write(path, _failing_items())
+
+    assert path.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [path]
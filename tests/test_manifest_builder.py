@@ -1,6 +1,14 @@
 import json
+import hashlib
 from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+
+from pipeline import manifest_builder
 from pipeline.manifest_builder import build_manifest_and_sign
+from pipeline.utils import json_codec
 
 
 def test_manifest_written(tmp_path):
@@ -23,3 +31,78 @@ def test_manifest_written(tmp_path):
     assert "@context" in data
     assert "distribution" in data
     assert len(data["distribution"]) == 2
+
+
+def _write_inputs(tmp_path):
+    firms = tmp_path / "firms.jsonld"
+    dataset = tmp_path / "dataset.jsonld"
+    firms.write_text("{}")
+    dataset.write_text("{}")
+    return firms, dataset, tmp_path / "manifest.jsonld"
+
+
+def test_manifest_unsigned_without_key(tmp_path, monkeypatch):
+    monkeypatch.delenv("VT_PRIVATE_KEY_PEM", raising=False)
+    firms, dataset, manifest = _write_inputs(tmp_path)
+
+    build_manifest_and_sign(firms, dataset, manifest)
+
+    assert "vt:signature" not in json.loads(manifest.read_text())
+
+
+def test_manifest_signature_verifies(tmp_path, monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    monkeypatch.setenv("VT_PRIVATE_KEY_PEM", pem.decode())
+    firms, dataset, manifest = _write_inputs(tmp_path)
+
+    build_manifest_and_sign(firms, dataset, manifest)
+
+    data = json.loads(manifest.read_text())
+    signature = data.pop("vt:signature")
+    assert signature["algorithm"] == "RSA-SHA256"
+    key.public_key().verify(
+        bytes.fromhex(signature["value"]),
+        json_codec.dumps_canonical(data),
+        padding.PKCS1v15(),
+        hashes.SHA256(),
+    )
+
+
+def test_manifest_ed25519_signature_verifies(tmp_path, monkeypatch):
+    key = ed25519.Ed25519PrivateKey.generate()
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    monkeypatch.setenv("VT_PRIVATE_KEY_PEM", pem.decode())
+    firms, dataset, manifest = _write_inputs(tmp_path)
+
+    build_manifest_and_sign(firms, dataset, manifest)
+
+    data = json.loads(manifest.read_text())
+    # written in canonical form, signature included
+    assert manifest.read_bytes() == json_codec.dumps_canonical(data) + b"\n"
+    signature = data.pop("vt:signature")
+    assert signature["algorithm"] == "Ed25519"
+    key.public_key().verify(
+        bytes.fromhex(signature["value"]),
+        json_codec.dumps_canonical(data),
+    )
+
+
+@pytest.mark.parametrize("threshold", [1 << 20, 1])
+def test_file_sha256_and_size_read_and_mmap_paths(tmp_path, monkeypatch, threshold):
+    monkeypatch.setattr(manifest_builder, "MMAP_HASH_THRESHOLD_BYTES", threshold)
+    path = tmp_path / "firms.jsonld"
+    path.write_bytes(b'{"@graph":[]}\n' * 1000)
+
+    digest, size = manifest_builder._file_sha256_and_size(path)
+
+    assert digest == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert size == path.stat().st_size
@@ -27,11 +27,29 @@ def test_normalize_basic_record():
 
     firms, offices = normalise_records(raw)
 
-    f = firms[0].model_dump()
-    o = offices[0].model_dump()
+    f = firms[0].to_dict()
+    o = offices[0].to_dict()
 
     assert f["sraId"] == "F123"
     assert f["name"] == "Test Firm"
     assert o["officeId"] == "O1"
     assert o["isHeadOffice"] is True
     assert o["address"]["addressLocality"] == "London"
+
+
+def test_office_without_street_is_dropped_and_logged(caplog):
+    raw = [
+        {
+            "Id": "F1",
+            "PracticeName": "Firm",
+            "Offices": [
+                {"OfficeId": "O1", "FirmId": "F1", "Town": "Leeds", "Postcode": "LS1", "Country": "UK"},
+                {"OfficeId": "O2", "Address1": "1 St", "Town": "Leeds", "Postcode": "LS1", "Country": "UK"},
+            ],
+        }
+    ]
+
+    _, offices = normalise_records(raw)
+
+    assert [o.officeId for o in offices] == ["O2"]
+    assert "office O1: no street address" in caplog.text
@@ -1,61 +1,86 @@
 import json
-from pathlib import Path
-from textwrap import dedent
+import shutil
+
+import pytest
+from pydantic import ValidationError
 
 from pipeline.run_pipeline import run
-from pipeline.utils.config_loader import load_config
-
-
-def test_pipeline_end_to_end(tmp_path, monkeypatch):
-    # Create temporary config.yaml
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        dedent(
-            """
-            input_file: "./response.txt"
-            raw_output_dir: "./raw"
-            normalized_output_dir: "./norm"
-            jsonld_firms: "./norm/firms.jsonld"
-            jsonld_dataset: "./norm/dataset.jsonld"
-            jsonld_manifest: "./norm/manifest.jsonld"
-            public_files_base: "https://api.test/files/"
-            public_id_base: "https://api.test/id/"
-            head_office_code: "HEAD OFFICE"
-            """
-        )
-    )
 
-    # Fake input
-    fake_input = tmp_path / "response.txt"
-    fake_input.write_text(
-        json.dumps(
-            [
-                {
-                    "Id": "F1",
-                    "PracticeName": "Firm One",
-                    "AuthorisationStatus": "Active",
-                    "Offices": [
-                        {
-                            "OfficeId": "O1",
-                            "OfficeType": "HEAD OFFICE",
-                            "Address1": "A",
-                            "Town": "T",
-                            "Postcode": "P",
-                            "Country": "UK",
-                        }
-                    ],
-                }
-            ]
-        )
+
+def test_pipeline_end_to_end(pipeline_run):
+    run_dir, cfg = pipeline_run
+
+    assert (run_dir / cfg.jsonld_firms).exists()
+    assert (run_dir / cfg.jsonld_dataset).exists()
+    assert (run_dir / cfg.jsonld_manifest).exists()
+
+
+def test_pipeline_shares_run_timestamp(pipeline_run):
+    run_dir, cfg = pipeline_run
+
+    dataset = json.loads((run_dir / cfg.jsonld_dataset).read_text())
+    manifest = json.loads((run_dir / cfg.jsonld_manifest).read_text())
+    assert dataset["dateModified"] == manifest["dateModified"]
+
+
+def _single_pass_dir(pipeline_run, tmp_path):
+    """Same config + input as pipeline_run, with emit_intermediates off."""
+    run_dir, _ = pipeline_run
+    shutil.copy(run_dir / "response.txt", tmp_path / "response.txt")
+    (tmp_path / "config.yaml").write_text(
+        (run_dir / "config.yaml").read_text() + "emit_intermediates: false\n"
     )
+    return tmp_path
+
 
-    # Change CWD so pipeline reads config + input correctly
+def test_single_pass_matches_intermediates_mode(pipeline_run, tmp_path, monkeypatch):
+    run_dir, cfg = pipeline_run
+    monkeypatch.chdir(_single_pass_dir(pipeline_run, tmp_path))
+
+    run()
+
+    assert (tmp_path / cfg.jsonld_firms).read_bytes() == (run_dir / cfg.jsonld_firms).read_bytes()
+    assert (tmp_path / cfg.jsonld_manifest).exists()
+    assert not (tmp_path / cfg.normalized_output_dir / "firms.json").exists()
+
+
+def test_single_pass_failure_leaves_no_tmp(pipeline_run, tmp_path, monkeypatch):
+    _, cfg = pipeline_run
+    monkeypatch.chdir(_single_pass_dir(pipeline_run, tmp_path))
+    records = json.loads((tmp_path / "response.txt").read_text())
+    records.append({"Id": "F2", "PracticeName": " "})
+    (tmp_path / "response.txt").write_text(json.dumps(records))
+
+    with pytest.raises(ValidationError):
+        run()
+
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert not (tmp_path / cfg.jsonld_firms).exists()
+
+
+def test_single_pass_after_staged_run_discards_intermediates(pipeline_run, tmp_path, monkeypatch, caplog):
+    run_dir, cfg = pipeline_run
     monkeypatch.chdir(tmp_path)
+    shutil.copy(run_dir / "response.txt", tmp_path / "response.txt")
+    staged_cfg = (run_dir / "config.yaml").read_text() + 'cache_dir: "./cache"\n'
+    (tmp_path / "config.yaml").write_text(staged_cfg)
 
     run()
+    norm = tmp_path / cfg.normalized_output_dir
+    assert (norm / "firms.json").exists()
+    assert any((tmp_path / "cache").iterdir())
+
+    records = json.loads((tmp_path / "response.txt").read_text())
+    records.append({"Id": "F2", "PracticeName": "Firm Two", "AuthorisationStatus": "Active"})
+    (tmp_path / "response.txt").write_text(json.dumps(records))
+    (tmp_path / "config.yaml").write_text(staged_cfg + "emit_intermediates: false\n")
 
-    cfg = load_config("config.yaml")
+    with caplog.at_level("INFO"):
+        run()
 
-    assert Path(cfg.jsonld_firms).exists()
-    assert Path(cfg.jsonld_dataset).exists()
-    assert Path(cfg.jsonld_manifest).exists()
+    assert not (norm / "firms.json").exists()
+    assert not (norm / "offices.json").exists()
+    assert not any((tmp_path / "cache").iterdir())
+    assert "Normalisation OK → 2 firms, 1 offices" in caplog.text
+    graph = json.loads((tmp_path / cfg.jsonld_firms).read_text())["@graph"]
+    assert [e["sraId"] for e in graph if "sraId" in e] == ["F1", "F2"]
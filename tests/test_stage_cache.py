@@ -0,0 +1,77 @@
+from pipeline import normalize
+from pipeline.normalize import normalise_records
+from pipeline.utils import stage_cache
+from pipeline.utils.atomic_writer import stream_write_json_array
+from pipeline.utils.config_loader import PipelineConfig
+
+
+def _cfg(**overrides):
+    base = dict(
+        input_file="in.json",
+        raw_output_dir="raw",
+        normalized_output_dir="norm",
+        jsonld_firms="f.jsonld",
+        jsonld_dataset="d.jsonld",
+        jsonld_manifest="m.jsonld",
+    )
+    return PipelineConfig(**{**base, **overrides})
+
+
+def test_stage_cache_roundtrip(tmp_path):
+    raw = [
+        {
+            "Id": 1,
+            "PracticeName": "Firm",
+            "Offices": [
+                {"OfficeId": 2, "Address1": "A", "Town": "T", "Postcode": "P", "Country": "UK"},
+            ],
+        }
+    ]
+    firms, offices = normalise_records(raw)
+    out = tmp_path / "norm"
+    stream_write_json_array(out / "firms.json", (f.to_dict() for f in firms))
+    stream_write_json_array(out / "offices.json", (o.to_dict() for o in offices))
+
+    entry = tmp_path / "cache" / "k"
+    assert stage_cache.load_normalized(entry, out) is None
+
+    stage_cache.store_normalized(entry, out)
+    cached_firms, cached_offices = stage_cache.load_normalized(entry, out)
+
+    assert [f.to_dict() for f in cached_firms] == [f.to_dict() for f in firms]
+    assert [o.to_dict() for o in cached_offices] == [o.to_dict() for o in offices]
+    assert sorted(p.name for p in out.iterdir()) == ["firms.json", "offices.json"]
+
+
+def test_stage_cache_key_tracks_input_and_config(tmp_path):
+    src = tmp_path / "in.json"
+    src.write_text("[]")
+    key = stage_cache.stage_cache_key(src, _cfg())
+
+    assert stage_cache.stage_cache_key(src, _cfg(subscription_key="x")) == key
+    assert stage_cache.stage_cache_key(src, _cfg(head_office_code="HQ")) != key
+
+    src.write_text("[ ]")
+    assert stage_cache.stage_cache_key(src, _cfg()) != key
+
+
+def test_stage_cache_key_tracks_normalize_version(tmp_path, monkeypatch):
+    src = tmp_path / "in.json"
+    src.write_text("[]")
+    key = stage_cache.stage_cache_key(src, _cfg())
+
+    monkeypatch.setattr(normalize, "NORMALIZE_VERSION", normalize.NORMALIZE_VERSION + 1)
+    assert stage_cache.stage_cache_key(src, _cfg()) != key
+
+
+def test_store_keeps_only_latest_entry(tmp_path):
+    out = tmp_path / "norm"
+    stream_write_json_array(out / "firms.json", [])
+    stream_write_json_array(out / "offices.json", [])
+    cache = tmp_path / "cache"
+    (cache / "notes").mkdir(parents=True)
+
+    stage_cache.store_normalized(cache / ("a" * 64), out)
+    stage_cache.store_normalized(cache / ("b" * 64), out)
+
+    assert sorted(p.name for p in cache.iterdir()) == ["b" * 64, "notes"]